@@ -1,15 +1,40 @@
+import os
 import streamlit as st
 from deep_translator import GoogleTranslator
-import pytesseract
+import deep_translator.google
 from PIL import Image
-import PyPDF2
-from pdf2image import convert_from_path
-from docx import Document
+import pypdfium2 as pdfium
+from pdf2image import convert_from_path, pdfinfo_from_path
+import zipfile
+from lxml import etree
 import tempfile
-import os
+import atexit
 import shutil
 import io
+import base64
+import html
 import requests
+from email.utils import formatdate
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import time
+import hashlib
+import re
+import diskcache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+import threading
+
+# Pool workers live in their own module so worker processes never re-run this script
+from workers import (
+    OCR_PAGE_SEG_MODE,
+    OCR_COLUMN_PAGE_SEG_MODE,
+    extract_pdf_pages,
+    binarize_for_ocr,
+    create_ocr_api,
+    init_ocr_worker,
+    ocr_image_file,
+)
 
 # --- PDF Generation using WeasyPrint (proper complex script support via Pango/HarfBuzz) ---
 from weasyprint import HTML, CSS
@@ -25,32 +50,243 @@ st.set_page_config(
 # --- AUTO-DOWNLOAD SINHALA FONT ---
 FONT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fonts")
 FONT_PATH = os.path.join(FONT_DIR, "NotoSansSinhala-Regular.ttf")
+# ETag of the downloaded font, used to revalidate it on restart
+FONT_ETAG_PATH = FONT_PATH + ".etag"
 # Note: Using the variable font URL for better compatibility, the function handles the download.
 FONT_URL = "https://github.com/google/fonts/raw/main/ofl/notosanssinhala/NotoSansSinhala%5Bwdth%2Cwght%5D.ttf"
 
 @st.cache_resource
 def download_sinhala_font():
-    """Download Noto Sans Sinhala font from Google Fonts."""
-    if os.path.exists(FONT_PATH):
-        return FONT_PATH
+    """
+    Download Noto Sans Sinhala font from Google Fonts.
+    A local copy is revalidated with a conditional request, so restarts only re-download when the font changed.
+    """
+    # An empty file is left behind by an interrupted download; fetch it again
+    has_local_font = os.path.exists(FONT_PATH) and os.path.getsize(FONT_PATH) > 0
+    headers = {}
+    if has_local_font:
+        headers['If-Modified-Since'] = formatdate(os.path.getmtime(FONT_PATH), usegmt=True)
+        if os.path.exists(FONT_ETAG_PATH):
+            with open(FONT_ETAG_PATH, 'r') as f:
+                headers['If-None-Match'] = f.read().strip()
     
+    partial_path = FONT_PATH + ".part"
     try:
         os.makedirs(FONT_DIR, exist_ok=True)
-        response = requests.get(FONT_URL, timeout=30)
-        response.raise_for_status()
-        
-        with open(FONT_PATH, 'wb') as f:
-            f.write(response.content)
+        with requests.get(FONT_URL, headers=headers, timeout=10 if has_local_font else 30, stream=True) as response:
+            if response.status_code == 304:
+                return FONT_PATH
+            response.raise_for_status()
+            
+            # Write to a temporary name first so a failed download never replaces a good font
+            with open(partial_path, 'wb') as f:
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    f.write(block)
+            os.replace(partial_path, FONT_PATH)
+            
+            etag = response.headers.get('ETag')
+            if etag:
+                with open(FONT_ETAG_PATH, 'w') as f:
+                    f.write(etag)
+            elif os.path.exists(FONT_ETAG_PATH):
+                # A stale ETag would never match again and force a re-download on every restart
+                os.unlink(FONT_ETAG_PATH)
         
         return FONT_PATH
     except Exception as e:
+        if os.path.exists(partial_path):
+            os.unlink(partial_path)
+        if os.path.exists(FONT_PATH) and os.path.getsize(FONT_PATH) > 0:
+            # Revalidation is best-effort; the cached font is still usable offline
+            return FONT_PATH
         # In a professional app, logging or a less intrusive error might be preferred
         st.error(f"Configuration Error: Failed to download Sinhala font for PDF generation. Check internet connection and deployment environment. Details: {e}")
         return None
 
 font_path = download_sinhala_font()
 
-# --- CORE FUNCTIONS (UNCHANGED) ---
+@st.cache_resource
+def load_font_data_url(path):
+    """Read the font once and embed it as a data: URL, so PDF generation never touches the font file."""
+    with open(path, 'rb') as f:
+        font_b64 = base64.b64encode(f.read()).decode('ascii')
+    return f"data:font/ttf;base64,{font_b64}"
+
+@st.cache_resource
+def get_font_config():
+    """Shared WeasyPrint font configuration; it is expensive to construct per PDF."""
+    return FontConfiguration()
+
+@st.cache_resource
+def get_pdf_render_lock():
+    """
+    Serializes PDF rendering across Streamlit sessions: each write_pdf registers @font-face
+    rules into the shared FontConfiguration, which mutates process-wide fontconfig/Pango state.
+    """
+    return threading.Lock()
+
+# Tesseract is CPU-bound, so OCR pages in parallel across a few processes
+OCR_MAX_WORKERS = min(os.cpu_count() or 1, 4)
+# Rendered pages waiting for or undergoing OCR; rendering pauses once this many are in flight
+OCR_MAX_PENDING_PAGES = 8
+# Translation chunks are network-bound; submissions are spaced to stay under ~10 requests/sec
+TRANSLATE_MAX_WORKERS = 8
+TRANSLATE_SUBMIT_INTERVAL = 0.1
+# Page-parallel text extraction for digital (non-scanned) PDFs. PDFium is not thread-safe,
+# so pages are split across processes, and only for documents long enough to pay for them.
+PDF_TEXT_MAX_WORKERS = min(os.cpu_count() or 1, 8)
+PDF_TEXT_PARALLEL_MIN_PAGES = 50
+# Poppler rasterization threads; leave one core free for the rest of the app
+PDF_RENDER_THREADS = max(1, (os.cpu_count() or 2) - 1)
+# 150 DPI grayscale is enough for typical scans and far fewer pixels than the 200 DPI RGB default
+OCR_DPI = 150
+
+# --- SHARED TEMP DIRECTORY ---
+@st.cache_resource
+def get_shared_tmp_dir():
+    """One process-wide scratch directory for uploads and rendered pages, removed at exit."""
+    tmp_dir = tempfile.mkdtemp(prefix='doctrans_')
+    atexit.register(shutil.rmtree, tmp_dir, ignore_errors=True)
+    return tmp_dir
+
+shared_tmp_dir = get_shared_tmp_dir()
+
+# --- PERSISTENT TRANSLATION CACHE ---
+# Repeated chunks (headers, footers, boilerplate) are served from disk instead of a new API call.
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".translate_cache")
+TRANSLATION_CACHE_TTL = 72 * 3600
+
+@st.cache_resource
+def open_translation_cache():
+    """Open the on-disk translation cache once per process rather than on every Streamlit rerun."""
+    return diskcache.Cache(CACHE_DIR, size_limit=2**30, eviction_policy='least-recently-used')
+
+translation_cache = open_translation_cache()
+
+@st.cache_resource
+def create_translate_session():
+    """Shared keep-alive HTTP session so translation chunks reuse TCP/TLS connections."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3)
+    )
+    session.mount('https://', adapter)
+    return session
+
+# deep_translator calls the module-level requests.get() for every translation, opening a fresh
+# connection each time. Route those calls through the pooled session instead.
+deep_translator.google.requests = create_translate_session()
+
+# --- CORE FUNCTIONS ---
+
+SINHALA_RE = re.compile(r'[\u0D80-\u0DFF]')
+LATIN_LETTER_RE = re.compile(r'[A-Za-z]')
+
+def needs_translation(text):
+    """Skip text with no English letters (numbers, punctuation, symbols) or that is already Sinhala."""
+    return bool(LATIN_LETTER_RE.search(text)) and not SINHALA_RE.search(text)
+
+def split_sentences(text):
+    """
+    Split text into sentences and lines, each keeping its trailing whitespace so the
+    original layout can be rebuilt. Whole sentences hash identically across documents,
+    which keeps the translation cache effective.
+    """
+    parts = re.split(r'((?<=[.!?])\s+|\n\s*)', text)
+    return [''.join(parts[i:i+2]) for i in range(0, len(parts), 2)]
+
+def pack_sentences(sentences, limit=4500):
+    """Greedily pack consecutive sentences into chunks of at most `limit` characters."""
+    chunks = []
+    current = []
+    current_len = 0
+    for sentence in sentences:
+        if current_len + len(sentence) <= limit:
+            current.append(sentence)
+            current_len += len(sentence)
+            continue
+        if current:
+            chunks.append(''.join(current))
+        # A single sentence longer than the limit has to be split by length
+        while len(sentence) > limit:
+            chunks.append(sentence[:limit])
+            sentence = sentence[limit:]
+        current = [sentence] if sentence else []
+        current_len = len(sentence)
+    if current:
+        chunks.append(''.join(current))
+    
+    return chunks
+
+def plan_translation(text, limit=4500):
+    r"""
+    Split text into (piece, should_translate) pairs. Only sentences that are already Sinhala
+    break a run; letter-less fragments such as list markers or page numbers stay inside the
+    surrounding chunk, and a run is bypassed only if none of it needs translation.
+
+    >>> plan_translation("1. Item one.\n2. Item two.\n")
+    [('1. Item one.\n2. Item two.\n', True)]
+    >>> plan_translation("Hello.\nලංකා\n12")
+    [('Hello.\n', True), ('ලංකා\n', False), ('12', False)]
+    """
+    pieces = []
+    run = []
+    
+    def flush_run():
+        if any(needs_translation(sentence) for sentence in run):
+            pieces.extend((chunk, True) for chunk in pack_sentences(run, limit=limit))
+        elif run:
+            pieces.append((''.join(run), False))
+        run.clear()
+    
+    for sentence in split_sentences(text):
+        if SINHALA_RE.search(sentence):
+            flush_run()
+            pieces.append((sentence, False))
+        else:
+            run.append(sentence)
+    flush_run()
+    
+    return pieces
+
+@st.cache_resource
+def get_translate_pool():
+    """
+    Long-lived translation thread pool plus per-thread state, shared across reruns and sessions
+    so each worker thread keeps its translators between calls.
+    """
+    executor = ThreadPoolExecutor(max_workers=TRANSLATE_MAX_WORKERS, thread_name_prefix='translate')
+    return executor, threading.local()
+
+def _get_translator(thread_state, source_lang, target_lang):
+    """
+    Reuse GoogleTranslator instances per language pair. GoogleTranslator keeps request
+    params on the instance, so each pool thread holds its own and they are never shared.
+    """
+    translators = getattr(thread_state, 'translators', None)
+    if translators is None:
+        translators = thread_state.translators = {}
+    key = (source_lang, target_lang)
+    if key not in translators:
+        translators[key] = GoogleTranslator(source=source_lang, target=target_lang)
+    return translators[key]
+
+def translation_cache_key(chunk, source_lang, target_lang):
+    """Cache key for a chunk and language pair."""
+    return hashlib.sha1(f"{source_lang}:{target_lang}:{chunk.strip()}".encode('utf-8')).hexdigest()
+
+def get_cached_translation(chunk, source_lang, target_lang):
+    """Return the cached translation of a chunk, or None if it has not been translated yet."""
+    return translation_cache.get(translation_cache_key(chunk, source_lang, target_lang))
+
+def translate_and_cache(chunk, source_lang, target_lang, thread_state):
+    """Translate a single chunk through the API and store the result in the cache. Runs on the translate pool."""
+    translator = _get_translator(thread_state, source_lang, target_lang)
+    translated = translator.translate(chunk.strip())
+    translation_cache.set(translation_cache_key(chunk, source_lang, target_lang), translated, expire=TRANSLATION_CACHE_TTL)
+    return translated
 
 def translate_text(text, source_lang='en', target_lang='si'):
     """Translate text between specified languages."""
@@ -58,69 +294,181 @@ def translate_text(text, source_lang='en', target_lang='si'):
         return "Please enter some text to translate."
     
     try:
-        translator = GoogleTranslator(source=source_lang, target=target_lang)
         max_length = 4500
         
-        if len(text) <= max_length:
-            return translator.translate(text)
+        # Pieces that need no translation stay verbatim and never reach the API or the cache
+        pieces = plan_translation(text, limit=max_length)
         
-        chunks = [text[i:i+max_length] for i in range(0, len(text), max_length)]
-        translated = []
+        executor, thread_state = get_translate_pool()
+        translate_chunk = partial(translate_and_cache, source_lang=source_lang, target_lang=target_lang, thread_state=thread_state)
+        translated = [piece for piece, _ in pieces]
+        futures = {}
+        for i, (piece, should_translate) in enumerate(pieces):
+            if not should_translate:
+                continue
+            # Cache hits are filled in directly; only misses are submitted and throttled
+            cached = get_cached_translation(piece, source_lang, target_lang)
+            if cached is not None:
+                translated[i] = cached
+                continue
+            if futures:
+                time.sleep(TRANSLATE_SUBMIT_INTERVAL)
+            futures[i] = executor.submit(translate_chunk, piece)
+        for i, future in futures.items():
+            translated[i] = future.result()
         
-        for chunk in chunks:
-            if chunk.strip():
-                translated.append(translator.translate(chunk))
+        # Translations come back stripped; restore each chunk's trailing whitespace
+        for i, (piece, should_translate) in enumerate(pieces):
+            if should_translate:
+                translated[i] += piece[len(piece.rstrip()):]
         
-        return " ".join(translated)
+        return "".join(translated).strip()
     
     except Exception as e:
         return f"Translation error: {str(e)}"
 
-def extract_text(file, use_ocr=False, ocr_lang='eng'):
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+MC_NS = '{http://schemas.openxmlformats.org/markup-compatibility/2006}'
+# mc:Fallback repeats mc:Choice content (e.g. text boxes) for older readers; pPr holds tab-stop definitions
+DOCX_SKIPPED_TAGS = {MC_NS + 'Fallback', WORD_NS + 'pPr'}
+DOCX_BREAK_TAGS = {WORD_NS + 'br', WORD_NS + 'cr'}
+
+def docx_element_text(element):
+    """Collect run text below an element, mapping tabs and line breaks the way python-docx does."""
+    parts = []
+    for child in element:
+        if child.tag in DOCX_SKIPPED_TAGS:
+            continue
+        if child.tag == WORD_NS + 't':
+            parts.append(child.text or '')
+        elif child.tag == WORD_NS + 'tab':
+            parts.append('\t')
+        elif child.tag in DOCX_BREAK_TAGS:
+            parts.append('\n')
+        else:
+            parts.append(docx_element_text(child))
+    return ''.join(parts)
+
+def extract_docx_text(docx_path):
+    """Stream paragraph text straight out of word/document.xml without building the python-docx object model."""
+    paragraphs = []
+    with zipfile.ZipFile(docx_path) as docx, docx.open('word/document.xml') as xml_file:
+        for _, paragraph in etree.iterparse(xml_file, tag=WORD_NS + 'p'):
+            if next(paragraph.iterancestors(MC_NS + 'Fallback'), None) is None:
+                paragraphs.append(docx_element_text(paragraph))
+            # Drop processed paragraphs and the siblings before them to keep memory flat on large documents
+            paragraph.clear()
+            while paragraph.getprevious() is not None:
+                del paragraph.getparent()[0]
+    return "\n".join(paragraphs)
+
+def ocr_pdf(pdf_path, ocr_lang, output_folder, ocr_psm=OCR_PAGE_SEG_MODE):
+    """
+    Render and OCR a PDF as a pipeline: pages are rendered in small batches and handed
+    to the OCR pool straight away, so Tesseract works on early pages while Poppler renders later ones.
+    """
+    num_pages = pdfinfo_from_path(pdf_path)["Pages"]
+    batch_size = min(PDF_RENDER_THREADS, OCR_MAX_PENDING_PAGES)
+    pending_pages = threading.BoundedSemaphore(OCR_MAX_PENDING_PAGES)
+    futures = []
+    
+    def release_page(image_path):
+        try:
+            os.unlink(image_path)
+        finally:
+            pending_pages.release()
+    
+    # Note: tesserocr dependencies (Tesseract) must be installed on the system
+    with ProcessPoolExecutor(
+        max_workers=OCR_MAX_WORKERS,
+        initializer=init_ocr_worker,
+        initargs=(ocr_lang, ocr_psm)
+    ) as executor:
+        for first_page in range(1, num_pages + 1, batch_size):
+            last_page = min(first_page + batch_size - 1, num_pages)
+            batch_pages = last_page - first_page + 1
+            for _ in range(batch_pages):
+                pending_pages.acquire()
+            
+            # Note: pdf2image dependencies (Poppler) must be installed on the system
+            # Pages are rendered to disk and dispatched by path to avoid pickling PIL images
+            # thread_count only takes effect with an output_folder. Very large documents may
+            # need a higher open-file limit on the host (e.g. `ulimit -n 10000`).
+            image_paths = convert_from_path(
+                pdf_path,
+                dpi=OCR_DPI,
+                grayscale=True,
+                fmt='jpeg',
+                output_folder=output_folder,
+                first_page=first_page,
+                last_page=last_page,
+                thread_count=PDF_RENDER_THREADS,
+                paths_only=True
+            )
+            for _ in range(batch_pages - len(image_paths)):
+                pending_pages.release()
+            
+            for image_path in image_paths:
+                future = executor.submit(ocr_image_file, image_path)
+                future.add_done_callback(lambda _, path=image_path: release_page(path))
+                futures.append(future)
+    
+    # Futures were submitted in page order, so results come back in page order
+    return [future.result() for future in futures]
+
+def extract_text(file, use_ocr=False, ocr_lang='eng', ocr_psm=OCR_PAGE_SEG_MODE):
     """Extract text from uploaded file."""
     tmp_paths_to_cleanup = []
+    tmp_dirs_to_cleanup = []
     extracted_text = ""
 
     try:
         file_ext = os.path.splitext(file.name)[1].lower()
         
         if file_ext == '.txt':
-            stringio = io.StringIO(file.getvalue().decode("utf-8", errors='ignore'))
-            extracted_text = stringio.read()
+            # getbuffer() is a zero-copy view of the upload, decoded without an intermediate bytes copy
+            extracted_text = str(file.getbuffer(), "utf-8", errors='ignore')
         
         elif file_ext == '.pdf':
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp:
-                shutil.copyfileobj(file, tmp)
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', dir=shared_tmp_dir) as tmp:
+                tmp.write(file.getbuffer())
                 tmp_path = tmp.name
             tmp_paths_to_cleanup.append(tmp_path)
             
             if use_ocr:
-                with tempfile.TemporaryDirectory() as tmpdir:
-                    # Note: pdf2image dependencies (Poppler) must be installed on the system
-                    images = convert_from_path(tmp_path, fmt='jpeg', output_folder=tmpdir)
-                    for img in images:
-                        # Note: pytesseract dependencies (Tesseract) must be installed on the system
-                        extracted_text += pytesseract.image_to_string(img, lang=ocr_lang) + "\n"
+                job_dir = tempfile.mkdtemp(dir=shared_tmp_dir)
+                tmp_dirs_to_cleanup.append(job_dir)
+                page_texts = ocr_pdf(tmp_path, ocr_lang, job_dir, ocr_psm)
+                extracted_text = "\n".join(page_texts)
             else:
-                with open(tmp_path, 'rb') as f:
-                    pdf = PyPDF2.PdfReader(f)
-                    for page in pdf.pages:
-                        page_text = page.extract_text()
-                        if page_text:
-                            extracted_text += page_text + "\n"
+                pdf = pdfium.PdfDocument(tmp_path)
+                num_pages = len(pdf)
+                pdf.close()
+                
+                if num_pages < PDF_TEXT_PARALLEL_MIN_PAGES:
+                    page_texts = extract_pdf_pages(tmp_path, range(num_pages))
+                else:
+                    # Split pages into one contiguous range per worker, keeping page order on reassembly
+                    workers = PDF_TEXT_MAX_WORKERS
+                    page_ranges = [range(num_pages)[i * num_pages // workers:(i + 1) * num_pages // workers] for i in range(workers)]
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        results = executor.map(partial(extract_pdf_pages, tmp_path), page_ranges)
+                        page_texts = [text for texts in results for text in texts]
+                extracted_text = "\n".join(text for text in page_texts if text)
         
         elif file_ext == '.docx':
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx') as tmp:
-                shutil.copyfileobj(file, tmp)
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.docx', dir=shared_tmp_dir) as tmp:
+                tmp.write(file.getbuffer())
                 tmp_path = tmp.name
             tmp_paths_to_cleanup.append(tmp_path)
             
-            doc = Document(tmp_path)
-            extracted_text = "\n".join([p.text for p in doc.paragraphs])
+            extracted_text = extract_docx_text(tmp_path)
             
         elif file_ext in ['.jpg', '.jpeg', '.png', '.bmp', '.tiff']:
             img = Image.open(file)
-            extracted_text = pytesseract.image_to_string(img, lang=ocr_lang)
+            with create_ocr_api(ocr_lang, ocr_psm) as api:
+                api.SetImage(binarize_for_ocr(img))
+                extracted_text = api.GetUTF8Text()
             
         else:
             return f"Unsupported file type: {file_ext}"
@@ -133,6 +481,38 @@ def extract_text(file, use_ocr=False, ocr_lang='eng'):
         for tmp_path in tmp_paths_to_cleanup:
             if os.path.exists(tmp_path):
                 os.unlink(tmp_path)
+        for tmp_dir in tmp_dirs_to_cleanup:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+# HTML skeleton for generated PDFs; only the font source and body vary per call
+PDF_HTML_TEMPLATE = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <style>
+        @font-face {{
+            font-family: 'NotoSansSinhala';
+            src: url('{font_src}');
+        }}
+        body {{
+            font-family: 'NotoSansSinhala', sans-serif;
+            font-size: 14px;
+            line-height: 1.8;
+            margin: 40px;
+            padding: 0;
+        }}
+        p {{
+            margin-bottom: 12px;
+            text-align: justify;
+        }}
+    </style>
+</head>
+<body>
+    {body}
+</body>
+</html>
+'''
 
 def generate_sinhala_pdf(text_content):
     """
@@ -145,52 +525,24 @@ def generate_sinhala_pdf(text_content):
     
     try:
         # Escape HTML special characters
-        import html
         safe_text = html.escape(text_content)
         
         # Convert newlines to HTML paragraphs
         paragraphs = safe_text.split('\n')
         # Use more robust line breaking by replacing consecutive newlines with <br> and wrapping text in <p>
-        html_paragraphs = ''.join([f'<p>{p}</p>' if p.strip() else '<br>' for p in paragraphs])
+        html_paragraphs = ''.join(f'<p>{p}</p>' if p.strip() else '<br>' for p in paragraphs)
         
-        # Create HTML with embedded font
-        html_content = f'''
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                @font-face {{
-                    font-family: 'NotoSansSinhala';
-                    src: url('file://{font_path}');
-                }}
-                body {{
-                    font-family: 'NotoSansSinhala', sans-serif;
-                    font-size: 14px;
-                    line-height: 1.8;
-                    margin: 40px;
-                    padding: 0;
-                }}
-                p {{
-                    margin-bottom: 12px;
-                    text-align: justify;
-                }}
-            </style>
-        </head>
-        <body>
-            {html_paragraphs}
-        </body>
-        </html>
-        '''
+        # Fill the template with the embedded font and content
+        html_content = PDF_HTML_TEMPLATE.format(font_src=load_font_data_url(font_path), body=html_paragraphs)
         
         # Generate PDF using WeasyPrint
-        font_config = FontConfiguration()
         html_doc = HTML(string=html_content)
         
         # Write to bytes buffer
         pdf_buffer = io.BytesIO()
         pdf_buffer.name = 'sinhala_translation.pdf' # Give the buffer a name for better downloading
-        html_doc.write_pdf(pdf_buffer, font_config=font_config)
+        with get_pdf_render_lock():
+            html_doc.write_pdf(pdf_buffer, font_config=get_font_config())
         pdf_buffer.seek(0)
         
         return pdf_buffer.getvalue()
@@ -331,6 +683,10 @@ with tab3:
         key="upload_si"
     )
     
+    col_layout_si, col_placeholder_si = st.columns([1, 3])
+    with col_layout_si:
+        multi_column_si = st.checkbox("Multi-column layout (newspapers, magazines)", value=False, key="columns_si")
+    
     st.markdown("---")
 
     if uploaded_sinhala_file is not None:
@@ -340,7 +696,8 @@ with tab3:
             use_ocr = file_ext != '.txt' 
 
             with st.spinner("Performing Sinhala OCR... (This may take a moment for large files)"):
-                extracted_si = extract_text(uploaded_sinhala_file, use_ocr=use_ocr, ocr_lang='sin')
+                ocr_psm = OCR_COLUMN_PAGE_SEG_MODE if multi_column_si else OCR_PAGE_SEG_MODE
+                extracted_si = extract_text(uploaded_sinhala_file, use_ocr=use_ocr, ocr_lang='sin', ocr_psm=ocr_psm)
             
             st.markdown("#### Extracted Content")
             st.text_area("🇱🇰 Extracted Sinhala Text", extracted_si, height=350, key="extracted_si")
@@ -0,0 +1,61 @@
+"""
+Process-pool workers for OCR and PDF text extraction.
+
+These live outside app.py so that worker processes can import them without
+re-running the Streamlit script, which matters under the spawn/forkserver
+start methods (macOS, Windows, and the Python 3.14+ Linux default).
+"""
+import os
+
+# Tesseract's internal OpenMP threading fights the page-level process pool
+# (severe slowdowns in containers), so pin it to one thread per process.
+# This must happen before tesserocr loads libtesseract.
+os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+
+from tesserocr import PyTessBaseAPI, OEM, PSM
+from PIL import Image
+import pypdfium2 as pdfium
+
+OCR_BINARIZE_THRESHOLD = 155
+# LSTM engine only, and treat each page as a single uniform block of text (skips layout analysis)
+OCR_ENGINE_MODE = OEM.LSTM_ONLY
+OCR_PAGE_SEG_MODE = PSM.SINGLE_BLOCK
+# Multi-column scans need full layout analysis to detect the columns; a single block reads straight across them
+OCR_COLUMN_PAGE_SEG_MODE = PSM.AUTO
+
+def extract_pdf_pages(pdf_path, page_indices):
+    """Extract text from the given pages. Each call opens its own PDFium document."""
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        texts = []
+        for i in page_indices:
+            page = pdf[i]
+            textpage = page.get_textpage()
+            texts.append(textpage.get_text_range())
+            textpage.close()
+            page.close()
+        return texts
+    finally:
+        pdf.close()
+
+def binarize_for_ocr(img):
+    """Convert an image to pure black and white, which Tesseract processes fastest."""
+    return img.convert('L').point(lambda x: 0 if x < OCR_BINARIZE_THRESHOLD else 255, '1')
+
+def create_ocr_api(lang, psm=OCR_PAGE_SEG_MODE):
+    """Create an in-process Tesseract API with the language model loaded once."""
+    return PyTessBaseAPI(lang=lang, oem=OCR_ENGINE_MODE, psm=psm)
+
+# Per-process Tesseract API, set up by init_ocr_worker in each OCR pool worker
+_ocr_api = None
+
+def init_ocr_worker(lang, psm):
+    """OCR pool initializer: load the Tesseract model once per worker process instead of once per page."""
+    global _ocr_api
+    _ocr_api = create_ocr_api(lang, psm)
+
+def ocr_image_file(image_path):
+    """OCR a rendered page from disk. Runs inside the OCR process pool."""
+    with Image.open(image_path) as img:
+        _ocr_api.SetImage(binarize_for_ocr(img))
+    return _ocr_api.GetUTF8Text()